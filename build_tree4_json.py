@@ -2,12 +2,16 @@
 """
 Build complete JSON for Tree 4: [Precision-Recall and ROC Curves Analysis]
 """
-import json
 import sys
 
+from tree4_json_io import write_tree_json
+
 # Tree ID
 TREE_ID = "cbce1155-abdf-4ed8-9f73-502fe47f0bce"
 
+# Compact output by default; pass --pretty for a human-readable file
+PRETTY = '--pretty' in sys.argv[1:]
+
 # We'll query the database via SQL and build the JSON
 # For now, let's use the data structure we know
 
@@ -49,7 +53,7 @@ SELECT
         'block_id', tn.block_id,
         'block_name', tb2.name,
         'content', COALESCE(nc.content, ''),
-        'provenance', COALESCE(tn.provenance, '{}'::jsonb),
+        'provenance', COALESCE(tn.provenance, '{{}}'::jsonb),
         'attachments', (SELECT json_agg(json_build_object(
           'id', na.id,
           'name', na.name,
@@ -149,11 +153,13 @@ tree_json = {
     }
 }
 
-# Write template
-with open('tree4_precision_recall_full.json', 'w', encoding='utf-8') as f:
-    json.dump(tree_json, f, indent=2, ensure_ascii=False)
+# Write template; nodes, if any, go one per line to a sibling .ndjson file
+output_file = 'tree4_precision_recall_full.json'
+nodes_file = write_tree_json(tree_json, output_file, pretty=PRETTY)
 
-print(f"\n✅ Created template JSON file: tree4_precision_recall_full.json")
+print(f"\n✅ Created template JSON file: {output_file}")
+if nodes_file:
+    print(f"   Nodes are written one per line to: {nodes_file}")
 print("   Note: This is a template. The full JSON with all 62 nodes needs to be")
 print("   generated from the database. Use the SQL query above or the Supabase MCP tool.")
 
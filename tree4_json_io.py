@@ -0,0 +1,62 @@
+"""
+Write Tree 4 JSON, with nodes optionally split out into an NDJSON file
+
+The main file always keeps the full schema (tree, blocks, nodes, summary).
+When the tree has nodes, they are written one per line to a sibling
+`.nodes.ndjson` file, so the node list is never serialized as one big string.
+The main file then keeps `"nodes": []` and records the sibling's name and
+node count under `nodes_file` and `nodes_count`.
+"""
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+
+def nodes_path(output_file):
+    """Return the NDJSON path that holds the nodes for output_file."""
+    root, _ = os.path.splitext(output_file)
+    return root + '.nodes.ndjson'
+
+
+def write_tree_json(tree_json, output_file, pretty=False):
+    """Write tree_json to output_file, streaming any nodes to the NDJSON sibling."""
+    nodes = tree_json.get('nodes') or []
+    nodes_file = nodes_path(output_file)
+    header = dict(tree_json, nodes=[])
+    if nodes:
+        # Point readers at the split-out nodes so "nodes": [] isn't taken literally
+        header['nodes_file'] = os.path.basename(nodes_file)
+        header['nodes_count'] = len(nodes)
+
+    # orjson always emits UTF-8, matching ensure_ascii=False
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(header, option=option))
+        if nodes:
+            with open(nodes_file, 'wb') as f:
+                for node in nodes:
+                    f.write(orjson.dumps(node, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(header, f, ensure_ascii=False,
+                      indent=2 if pretty else None,
+                      separators=None if pretty else (',', ':'))
+        if nodes:
+            with open(nodes_file, 'w', encoding='utf-8') as f:
+                for node in nodes:
+                    f.write(json.dumps(node, ensure_ascii=False, separators=(',', ':')))
+                    f.write('\n')
+
+    # Don't leave nodes from an earlier run next to a header that has none
+    if not nodes and os.path.exists(nodes_file):
+        os.remove(nodes_file)
+
+    return nodes_file if nodes else None
+